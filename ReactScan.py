@@ -1,10 +1,40 @@
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
+import html as html_lib
+import multiprocessing
+import os
 import re
-from typing import List, Dict, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Iterable, List, Dict, Optional
+from urllib.parse import urljoin, urlparse
 from playwright.async_api import async_playwright
 
+try:
+    import uvloop  # 可选：libuv 事件循环，提升大批量网络I/O吞吐
+except ImportError:  # Windows 等平台无 uvloop，回退到标准事件循环
+    uvloop = None
+
+def _run(coro):
+    """运行顶层协程：已安装 uvloop 时使用 uvloop 事件循环"""
+    if uvloop is None:
+        return asyncio.run(coro)
+    if hasattr(uvloop, "run"):
+        return uvloop.run(coro)
+    # uvloop < 0.18 没有 uvloop.run，手动创建 uvloop 事件循环
+    loop = uvloop.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coro)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
 # 修复：适配 React 18+ 新特征 + 重定向处理
 REACT_FINGERPRINTS = {
     "core": {
@@ -54,44 +84,342 @@ REACT_FINGERPRINTS = {
     ]
 }
 
+
+# 指纹表预处理：导入时一次性转为小写字节的不可变结构，热路径只做集合运算
+# (原始写法, 小写字节)
+_CORE_KW_BYTES = tuple((kw, kw.lower().encode()) for kw in REACT_FINGERPRINTS["core"]["js_keywords"])
+_URL_PATTERNS_BYTES = tuple((p, p.lower().encode()) for p in REACT_FINGERPRINTS["core"]["js_url_patterns"])
+_DOM_ATTRS_BYTES = tuple((attr, attr.lower().encode()) for attr in REACT_FINGERPRINTS["core"]["dom_attrs"])
+# (描述, 小写字节关键词, 展示用关键词串)
+_AUX_GROUPS_BYTES = tuple(
+    (group["desc"], tuple(kw.lower().encode() for kw in group["keywords"]), ", ".join(group["keywords"]))
+    for group in REACT_FINGERPRINTS["auxiliary"]
+)
+_ALL_CORE_KEYWORDS = frozenset(kw for _, kw in _CORE_KW_BYTES)
+_DOM_ATTR_NAMES = frozenset(attr for _, attr in _DOM_ATTRS_BYTES)
+
+
+class _KeywordScanner:
+    """多关键词扫描器：逐词做字节子串查找
+
+    bytes 的 in 运算为C实现的快速子串搜索，比把关键词合并为正则交替更快，且天然支持相互重叠的关键词
+    """
+
+    def __init__(self, keywords, ignore_case: bool = False):
+        self.keywords = tuple(dict.fromkeys(keywords))  # 小写字节
+        self.ignore_case = ignore_case  # 为 True 时输入无需预先转小写
+        # 分块扫描时需保留的重叠字节数，保证跨块的关键词不会漏检
+        self.overlap = max(len(kw) for kw in self.keywords) - 1
+
+    def scan(self, data: bytes, found: frozenset = frozenset()) -> set:
+        """返回字节串中命中的（小写字节）关键词集合，已在 found 中的关键词不再查找；
+        未开启 ignore_case 时 data 需已转小写"""
+        if self.ignore_case:
+            data = data.lower()
+        return {kw for kw in self.keywords if kw not in found and kw in data}
+
+
+# 关键词表只构建一次，热路径不再逐词转换大小写/编码
+CORE_KW_SCANNER = _KeywordScanner(_ALL_CORE_KEYWORDS)
+AUX_KW_SCANNER = _KeywordScanner(kw for _, kws, _ in _AUX_GROUPS_BYTES for kw in kws)
+JS_URL_SCANNER = _KeywordScanner((p for _, p in _URL_PATTERNS_BYTES), ignore_case=True)
+_JS_CHUNK_SIZE = 1 << 16
+_SCAN_OFFLOAD_BYTES = 1 << 18  # 超过该大小的页面才放到线程池中扫描
+_CONNECTIONS_PER_HOST = 16  # 单主机连接上限（典型页面的JS数量为10~30个，多集中在同一CDN）
+_JS_CONTENT_TYPES = frozenset({
+    "application/javascript",
+    "text/javascript",
+    "application/x-javascript",
+    "text/x-javascript",
+    "application/ecmascript",
+    "text/ecmascript",
+    "text/plain",
+    "application/octet-stream",  # 服务端未返回 Content-Type 时 aiohttp 的默认值
+})
+_SKIP_JS_EXTENSIONS = (".map", ".css", ".wasm", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".woff", ".woff2")
+_BATCH_LOOKAHEAD = 8  # 批量探测时每个并发名额对应的排队窗口（消费者数 = 并发数 × 该值）
+_JS_CACHE_SIZE = 10000  # JS扫描结果缓存上限（按URL，LRU淘汰）
+_JS_OVERLAP = max(CORE_KW_SCANNER.overlap, AUX_KW_SCANNER.overlap)
+# Playwright 页面探测脚本：按属性路径判断全局变量是否存在（不使用 eval，避免受页面 CSP 限制）
+_PLAYWRIGHT_PROBE_JS = """(vars) => ({
+    jsUrls: Array.from(document.querySelectorAll("script[src]"), el => el.src),
+    globalVars: vars.filter(v => {
+        try {
+            return v.split(".").reduce((obj, key) => (obj == null ? undefined : obj[key]), globalThis) !== undefined;
+        } catch (e) {
+            return false;
+        }
+    }),
+})"""
+
+# 标签属性按“属性名[=值]”成对切分：带引号的属性值整体跳过，值里出现的属性名不会被当作属性
+# 均直接作用于原始字节（忽略大小写匹配），无需解码或整页 lower() 复制
+TAG_ATTR_RE = re.compile(rb"""[\s/]*([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?""")
+# 直接在原始字节上提取 <script src>，替代 BeautifulSoup 整树解析；注释整体跳过
+SCRIPT_OPEN_RE = re.compile(rb"""<!--.*?(?:-->|\Z)|<script\b([^>]*)>""", re.IGNORECASE | re.DOTALL)
+SCRIPT_CLOSE_RE = re.compile(rb"""</script\s*>""", re.IGNORECASE)
+# DOM属性检测分两步：先定位 data-react 出现的位置并取其所在标签，再逐个属性名比对（避免命中正文文本和属性值）
+DATA_REACT_RE = re.compile(rb"data-react", re.IGNORECASE)
+TAG_NAME_RE = re.compile(rb"<[a-z][^\s/>]*", re.IGNORECASE)
+
+
+def _iter_tag_attrs(attrs: bytes):
+    """逐个产出标签内的 (小写属性名, 属性值)，无值属性的值为空串"""
+    for name, double, single, bare in TAG_ATTR_RE.findall(attrs):
+        yield name.lower(), double or single or bare
+
+
+def _extract_script_srcs(html: bytes) -> List[bytes]:
+    """按出现顺序返回 <script src> 原始值；跳过HTML注释和内联脚本正文中的伪标签"""
+    srcs = []
+    pos = 0
+    while True:
+        match = SCRIPT_OPEN_RE.search(html, pos)
+        if match is None:
+            return srcs
+        pos = match.end()
+        if match.group(1) is None:
+            continue  # HTML注释
+        for name, value in _iter_tag_attrs(match.group(1)):
+            if name == b"src":
+                srcs.append(value)
+                break
+        # 跳过脚本正文，正文里字符串形式的 <script src> 不算
+        close = SCRIPT_CLOSE_RE.search(html, pos)
+        pos = close.end() if close else len(html)
+
+
+def _find_dom_attrs(html: bytes) -> set:
+    """单次扫描HTML字节，返回出现的React专属DOM属性（小写字节）"""
+    found = set()
+    seen_tags = set()
+    for match in DATA_REACT_RE.finditer(html):
+        start = html.rfind(b"<", 0, match.start())
+        if start < 0 or start in seen_tags or html.rfind(b">", start, match.start()) >= 0:
+            continue  # 不在标签内（正文文本）或该标签已处理
+        seen_tags.add(start)
+        tag_name = TAG_NAME_RE.match(html, start)
+        if tag_name is None:
+            continue
+        end = html.find(b">", match.end())
+        attrs = html[tag_name.end():end if end >= 0 else len(html)]
+        found.update(name for name, _ in _iter_tag_attrs(attrs) if name in _DOM_ATTR_NAMES)
+    return found
+
+
+def _scan_page(html: Optional[bytes], js_urls: List[str]) -> List[str]:
+    """页面本地分析（纯函数，可在线程池中执行）：DOM属性 + JS URL特征"""
+    evidence = []
+    # DOM属性
+    if html:
+        dom_hits = _find_dom_attrs(html)
+        for attr, attr_bytes in _DOM_ATTRS_BYTES:
+            if attr_bytes in dom_hits:
+                evidence.append(f"[核心] DOM含React专属属性: {attr}")
+
+    # JS URL特征（含 React 18+）：每个URL单次扫描，不再逐特征匹配
+    for js_url in js_urls:
+        url_hits = JS_URL_SCANNER.scan(js_url.encode())
+        if not url_hits:
+            continue
+        for pattern, pattern_bytes in _URL_PATTERNS_BYTES:
+            if pattern_bytes in url_hits:
+                evidence.append(f"[核心] JS URL含React特征: {js_url}（匹配：{pattern}）")
+    return evidence
+
+
+def _scan_js_chunk(buf: bytes, core_found: frozenset, aux_found: frozenset) -> tuple:
+    """扫描一段已转小写的JS字节（纯函数，可在线程池中执行），返回新增的 (核心命中, 辅助命中)"""
+    return CORE_KW_SCANNER.scan(buf, core_found), AUX_KW_SCANNER.scan(buf, aux_found)
+
+
+class _HostLimiter:
+    """按主机限流的并发池：每主机软上限 + 可突发额度，另有全局硬上限
+
+    有空位时 acquire 不让出事件循环；满额时挂起到等待队列，释放时直接把名额交给可运行的等待者。
+    """
+
+    def __init__(self, per_host: int, total: int, burst_limit: int = 0):
+        self.per_host = per_host
+        self.total = total
+        self.burst_limit = burst_limit
+        self._inflight: Dict[str, int] = {}
+        self._total_inflight = 0
+        self._waiters = deque()  # (host, future)
+        self._waiting_hosts: Dict[str, int] = {}
+
+    def _can_acquire(self, host: str) -> bool:
+        if self._total_inflight >= self.total:
+            return False
+        inflight = self._inflight.get(host, 0)
+        if inflight < self.per_host:
+            return True
+        # 超出软上限时仅在其他主机没有可运行的等待者时才允许突发
+        if inflight >= self.per_host + self.burst_limit:
+            return False
+        return not any(
+            self._inflight.get(other, 0) < self.per_host
+            for other in self._waiting_hosts
+            if other != host
+        )
+
+    def _take(self, host: str):
+        self._inflight[host] = self._inflight.get(host, 0) + 1
+        self._total_inflight += 1
+
+    def _remove_waiter(self, host: str):
+        self._waiting_hosts[host] -= 1
+        if not self._waiting_hosts[host]:
+            del self._waiting_hosts[host]
+
+    async def acquire(self, host: str):
+        if not self._waiters and self._can_acquire(host):
+            self._take(host)  # 快速路径：不让出事件循环
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append((host, fut))
+        self._waiting_hosts[host] = self._waiting_hosts.get(host, 0) + 1
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release(host)  # 名额已交接但调用方被取消，归还名额
+            else:
+                self._waiters.remove((host, fut))
+                self._remove_waiter(host)
+            raise
+
+    def release(self, host: str):
+        self._inflight[host] -= 1
+        if not self._inflight[host]:
+            del self._inflight[host]
+        self._total_inflight -= 1
+        # 按排队顺序把名额交给可运行的等待者（被per_host卡住的主机不阻塞其他主机）
+        for waiter in list(self._waiters):
+            if self._total_inflight >= self.total:
+                break
+            waiter_host, fut = waiter
+            if self._can_acquire(waiter_host):
+                self._waiters.remove(waiter)
+                self._remove_waiter(waiter_host)
+                self._take(waiter_host)
+                fut.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        await self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+
 class ReactDetector:
     def __init__(
         self,
         timeout: int = 10,
         concurrency: int = 5,
         use_playwright: bool = False,
-        user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"  # 更新UA适配现代站点
+        user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",  # 更新UA适配现代站点
+        cdp_endpoint: Optional[str] = None,  # 可选：连接外部已启动的 Chromium（CDP 地址）
+        workers: int = 1,  # 批量探测的进程数，>1 时每个进程各跑一个事件循环
+        per_host: Optional[int] = None,  # 单主机并发软上限（默认为总并发的一半）
+        thorough: bool = False,  # 完整模式：结论确定后仍检测全部JS，输出完整证据链
+        max_js_bytes: int = 4 * 1024 * 1024,  # 单个JS最多扫描的字节数
     ):
         self.timeout = timeout
         self.concurrency = concurrency
+        self.per_host = per_host or max(1, concurrency // 2)
+        self.thorough = thorough
+        self.max_js_bytes = max_js_bytes
         self.use_playwright = use_playwright
         self.user_agent = user_agent
+        self.cdp_endpoint = cdp_endpoint
+        self.workers = max(1, workers)
         self.session_headers = {"User-Agent": self.user_agent}
+        # Playwright 浏览器整批共享，首次使用时再启动
+        self._pw = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        # 扫描线程池：正则扫描在此执行，事件循环继续驱动其他URL的网络I/O
+        self._scan_pool: Optional[ThreadPoolExecutor] = None
+        # JS扫描结果缓存：同一JS URL在整批内只下载、扫描一次（并发请求共享同一任务）
+        self._js_cache: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+        self._js_refs: Dict[str, int] = {}  # 正在等待各JS任务的页面数
+
+    async def _ensure_browser(self):
+        """惰性启动（或连接）共享浏览器，避免每个URL都拉起一次 Chromium 进程"""
+        async with self._browser_lock:
+            if self._browser is None:
+                if self._pw is None:
+                    self._pw = await async_playwright().start()
+                if self.cdp_endpoint:
+                    self._browser = await self._pw.chromium.connect_over_cdp(self.cdp_endpoint)
+                else:
+                    self._browser = await self._pw.chromium.launch(headless=True)
+        return self._browser
+
+    def _get_scan_pool(self) -> ThreadPoolExecutor:
+        if self._scan_pool is None:
+            self._scan_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        return self._scan_pool
+
+    async def _run_scan(self, size: int, func, *args):
+        """执行扫描函数：数据较小时直接在事件循环中执行，超过阈值才切换到线程池（避免无谓的线程往返）"""
+        if size < _SCAN_OFFLOAD_BYTES:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._get_scan_pool(), func, *args)
+
+    async def close(self):
+        """释放共享浏览器资源、扫描线程池及JS缓存"""
+        self._js_cache.clear()
+        self._js_refs.clear()
+        if self._scan_pool is not None:
+            self._scan_pool.shutdown(wait=False)
+            self._scan_pool = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+    def create_session(self) -> aiohttp.ClientSession:
+        """创建共享会话：连接池 + DNS缓存，批量内复用 keep-alive 连接"""
+        # aiohttp 仅支持 HTTP/1.1：放宽单主机连接数以覆盖一个页面的JS扇出，
+        # 并延长空闲连接保活时间，使同一CDN的连接在批量内的多个页面间持续复用
+        connector = aiohttp.TCPConnector(
+            limit=max(self.concurrency * 4, _CONNECTIONS_PER_HOST),
+            limit_per_host=_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        return aiohttp.ClientSession(
+            headers=self.session_headers,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
 
     async def fetch_with_playwright(self, url: str) -> Dict[str, any]:
         """Playwright 模式：自动跟随重定向，适配 React 18+"""
         result = {"html": None, "js_urls": [], "global_vars": [], "redirect_url": None, "error": None}
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page(user_agent=self.user_agent)
-                # 监听重定向，记录最终URL
-                page.on("framenavigated", lambda frame: setattr(result, "redirect_url", frame.url) if frame == page.main_frame else None)
+            browser = await self._ensure_browser()
+            # 每个URL使用独立的 context（隔离 cookie/缓存），浏览器进程共享
+            context = await browser.new_context(user_agent=self.user_agent)
+            try:
+                page = await context.new_page()
                 await page.goto(url, timeout=self.timeout * 1000)
                 await page.wait_for_load_state("networkidle")
                 
-                result["html"] = await page.content()
+                result["html"] = (await page.content()).encode()
                 result["redirect_url"] = page.url  # 记录最终跳转后的URL
-                js_urls = await page.eval_on_selector_all("script[src]", "els => els.map(el => el.src)")
-                result["js_urls"] = [url for url in js_urls if url]
-                
-                # 检测核心全局变量（含 React 18+ 新增）
-                for var in REACT_FINGERPRINTS["core"]["global_vars"]:
-                    exists = await page.evaluate(f"typeof {var} !== 'undefined'")
-                    if exists:
-                        result["global_vars"].append(var)
-                
-                await browser.close()
+                # 脚本地址与核心全局变量（含 React 18+ 新增）合并为一次页面调用
+                probe = await page.evaluate(_PLAYWRIGHT_PROBE_JS, REACT_FINGERPRINTS["core"]["global_vars"])
+                result["js_urls"] = [js_url for js_url in probe["jsUrls"] if js_url]
+                result["global_vars"] = probe["globalVars"]
+            finally:
+                await context.close()
         except Exception as e:
             result["error"] = f"Playwright 加载失败: {str(e)}"
         return result
@@ -106,15 +434,12 @@ class ReactDetector:
                 if response.status != 200:
                     result["error"] = f"HTTP状态码异常: {response.status}（最终URL：{result['redirect_url']}）"
                     return result
-                html = await response.text()
-                result["html"] = html
-                
-                soup = BeautifulSoup(html, "html.parser")
-                script_tags = soup.find_all("script")
-                for script in script_tags:
-                    js_url = script.get("src")
+                body = await response.read()
+                result["html"] = body  # 保留原始字节，后续扫描不再解码整页
+
+                for src in _extract_script_srcs(body):
+                    js_url = html_lib.unescape(src.decode("utf-8", errors="replace")).strip()
                     if js_url:
-                        from urllib.parse import urljoin
                         js_url = urljoin(result["redirect_url"], js_url)  # 使用跳转后的URL补全相对路径
                         result["js_urls"].append(js_url)
         except Exception as e:
@@ -122,33 +447,104 @@ class ReactDetector:
         return result
 
     async def check_js_content(self, session: aiohttp.ClientSession, js_url: str) -> Dict[str, List[str]]:
-        """检查JS内容（适配 React 18+ 关键词）"""
-        result = {"core": [], "auxiliary": []}
+        """检查JS内容（适配 React 18+ 关键词）
+
+        failed 标记请求失败（超时/网络异常/非200），结果不可缓存；
+        partial 标记非 thorough 模式下结论已定、提前停止扫描，证据不完整
+        """
+        result = {"core": [], "auxiliary": [], "failed": False, "partial": False}
+        # 按扩展名排除明显不是JS的资源（source map、样式、图片等），不发请求
+        if urlparse(js_url).path.lower().endswith(_SKIP_JS_EXTENSIONS):
+            return result
         try:
             async with session.get(js_url, timeout=self.timeout, allow_redirects=True) as response:  # JS文件也可能重定向
                 if response.status != 200:
+                    result["failed"] = True
                     return result
-                js_content = await response.text()
-                js_lower = js_content.lower()
+                # 读取响应体前按 Content-Type 排除非JS内容（如软404返回的HTML页面）
+                if response.content_type not in _JS_CONTENT_TYPES:
+                    return result
+                # 分块流式扫描：证据全部命中（或非 thorough 模式下结论已定）后提前放弃剩余响应体
+                core_hits, aux_hits = set(), set()
+                tail = b""
+                remaining = self.max_js_bytes  # 超大文件只扫描前 max_js_bytes 字节
+                async for chunk in response.content.iter_chunked(_JS_CHUNK_SIZE):
+                    chunk = chunk[:remaining]
+                    remaining -= len(chunk)
+                    buf = tail + chunk.lower()
+                    # 单块不超过 64 KiB，子串查找为C实现的微秒级操作，直接在事件循环中执行
+                    chunk_core, chunk_aux = _scan_js_chunk(buf, frozenset(core_hits), frozenset(aux_hits))
+                    core_hits |= chunk_core
+                    aux_hits |= chunk_aux
+                    aux_groups = sum(aux_hits.issuperset(kws) for _, kws, _ in _AUX_GROUPS_BYTES)
+                    if remaining <= 0 or (core_hits >= _ALL_CORE_KEYWORDS and aux_groups == len(_AUX_GROUPS_BYTES)):
+                        response.close()
+                        break
+                    if not self.thorough and (core_hits or aux_groups >= 2):
+                        # 一条核心证据或两组辅助证据即可判定为React
+                        result["partial"] = True
+                        response.close()
+                        break
+                    tail = buf[-_JS_OVERLAP:]
 
-                # 检测核心JS关键词（含 React 18+）
-                for keyword in REACT_FINGERPRINTS["core"]["js_keywords"]:
-                    if re.search(re.escape(keyword.lower()), js_lower):
+                # 检测核心JS关键词（含 React 18+）：集合判定
+                for keyword, kw_bytes in _CORE_KW_BYTES:
+                    if kw_bytes in core_hits:
                         result["core"].append(f"JS源码含React核心API: {keyword}")
 
                 # 检测辅助证据组（含 React 18+）
-                for group in REACT_FINGERPRINTS["auxiliary"]:
-                    group_kws = [kw.lower() for kw in group["keywords"]]
-                    if all(re.search(re.escape(kw), js_lower) for kw in group_kws):
-                        result["auxiliary"].append(f"{group['desc']}（匹配：{', '.join(group['keywords'])}）")
+                for desc, kws, kw_display in _AUX_GROUPS_BYTES:
+                    if aux_hits.issuperset(kws):
+                        result["auxiliary"].append(f"{desc}（匹配：{kw_display}）")
         except (asyncio.TimeoutError, aiohttp.ClientError):
-            pass
+            result["failed"] = True
         except Exception:
-            pass
+            result["failed"] = True
         return result
 
-    async def detect_single_url(self, url: str) -> Dict[str, any]:
-        """核心探测逻辑（含重定向提示）"""
+    def get_js_result(self, session: aiohttp.ClientSession, js_url: str) -> "asyncio.Task":
+        """获取JS扫描任务（带缓存），公共CDN上的同一份 vendor 包不会重复下载
+
+        使用完毕后需调用 _release_js_result 归还引用
+        """
+        task = self._js_cache.get(js_url)
+        if task is not None and self.thorough and task.done() and not task.cancelled() and task.result()["partial"]:
+            task = None  # 提前停止的不完整结果不能当作完整证据复用
+        if task is None:
+            task = asyncio.create_task(self.check_js_content(session, js_url))
+            task.add_done_callback(lambda done, js_url=js_url: self._evict_failed_js(js_url, done))
+            self._js_cache[js_url] = task
+            if len(self._js_cache) > _JS_CACHE_SIZE:
+                self._js_cache.popitem(last=False)
+        else:
+            self._js_cache.move_to_end(js_url)
+        self._js_refs[js_url] = self._js_refs.get(js_url, 0) + 1
+        return task
+
+    def _evict_failed_js(self, js_url: str, task: "asyncio.Task"):
+        """只缓存成功的扫描：失败的请求移出缓存，后续页面重新获取"""
+        if task.cancelled() or task.result()["failed"]:
+            if self._js_cache.get(js_url) is task:
+                del self._js_cache[js_url]
+
+    def _release_js_result(self, js_url: str, task: "asyncio.Task"):
+        """归还JS扫描任务引用；已无页面等待且未完成的任务直接取消并移出缓存"""
+        refs = self._js_refs.get(js_url, 0) - 1
+        if refs > 0:
+            self._js_refs[js_url] = refs
+            return
+        self._js_refs.pop(js_url, None)
+        if not task.done():
+            task.cancel()
+            if self._js_cache.get(js_url) is task:
+                del self._js_cache[js_url]
+
+    async def detect_single_url(self, url: str, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, any]:
+        """核心探测逻辑（含重定向提示）；未传入 session 时临时创建一个"""
+        if session is None:
+            async with self.create_session() as session:
+                return await self.detect_single_url(url, session)
+
         result = {
             "url": url,
             "final_url": url,  # 最终访问的URL（含重定向）
@@ -163,8 +559,7 @@ class ReactDetector:
         if self.use_playwright:
             page_data = await self.fetch_with_playwright(url)
         else:
-            async with aiohttp.ClientSession(headers=self.session_headers) as session:
-                page_data = await self.fetch_page(session, url)
+            page_data = await self.fetch_page(session, url)
 
         if page_data["error"]:
             result["error"] = page_data["error"]
@@ -174,36 +569,60 @@ class ReactDetector:
         if page_data["redirect_url"]:
             result["final_url"] = page_data["redirect_url"]
 
-        # 2. 检测核心证据（含 React 18+ 特征）
+        # 2. 检测核心证据（含 React 18+ 特征）；证据用有序字典累积，插入即去重
+        core_evidence: Dict[str, None] = {}
+        aux_evidence: Dict[str, None] = {}
         # 2.1 全局变量
         for var in page_data.get("global_vars", []):
-            result["core_evidence"].append(f"[核心] 存在React全局变量: {var}")
-        
-        # 2.2 DOM属性
-        if page_data["html"]:
-            soup = BeautifulSoup(page_data["html"], "html.parser")
-            for attr in REACT_FINGERPRINTS["core"]["dom_attrs"]:
-                if soup.find(attrs={attr: True}):
-                    result["core_evidence"].append(f"[核心] DOM含React专属属性: {attr}")
-        
-        # 2.3 JS URL特征（含 React 18+）
-        for js_url in page_data["js_urls"]:
-            for pattern in REACT_FINGERPRINTS["core"]["js_url_patterns"]:
-                if pattern.lower() in js_url.lower():
-                    result["core_evidence"].append(f"[核心] JS URL含React特征: {js_url}（匹配：{pattern}）")
-        
-        # 2.4 JS内容核心关键词（含 React 18+）
-        if page_data["js_urls"]:
-            async with aiohttp.ClientSession(headers=self.session_headers) as session:
-                js_tasks = [self.check_js_content(session, js_url) for js_url in page_data["js_urls"]]
-                js_results = await asyncio.gather(*js_tasks, return_exceptions=False)
-                for js_res in js_results:
-                    result["core_evidence"].extend(js_res["core"])
-                    result["aux_evidence"].extend(js_res["auxiliary"])
-
-        # 3. 去重证据
-        result["core_evidence"] = list(dict.fromkeys(result["core_evidence"]))
-        result["aux_evidence"] = list(dict.fromkeys(result["aux_evidence"]))
+            core_evidence[f"[核心] 存在React全局变量: {var}"] = None
+
+        # 2.2 DOM属性 + 2.3 JS URL特征（大页面放到线程池执行，不阻塞其他URL的网络I/O）
+        scan_args = (len(page_data["html"] or b""), _scan_page, page_data["html"], page_data["js_urls"])
+        js_urls = list(dict.fromkeys(page_data["js_urls"]))
+        if not self.thorough:
+            # 先做廉价的页面本地分析：已有核心证据时结论已定，不再发出任何JS请求
+            core_evidence.update(dict.fromkeys(await self._run_scan(*scan_args)))
+            if core_evidence:
+                js_urls = []
+        # 复用其他页面发起的JS任务时，若该任务失败，本页面可重新请求一次
+        can_retry = [js_url in self._js_cache for js_url in js_urls]
+        js_tasks = [self.get_js_result(session, js_url) for js_url in js_urls]
+        try:
+            if self.thorough:
+                # thorough 模式先发起JS内容检测（I/O），在请求进行中完成页面本地分析（CPU）
+                core_evidence.update(dict.fromkeys(await self._run_scan(*scan_args)))
+
+            # 2.4 JS内容核心关键词（含 React 18+）：按完成顺序检查，结论确定后不再等待剩余JS
+            if js_tasks:
+                pending = set(js_tasks)
+                aux_seen = set()
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    settled = False
+                    for task in done:
+                        index = js_tasks.index(task)
+                        if task.result()["failed"] and can_retry[index]:
+                            can_retry[index] = False
+                            self._release_js_result(js_urls[index], task)
+                            js_tasks[index] = self.get_js_result(session, js_urls[index])
+                            pending.add(js_tasks[index])
+                            continue
+                        aux_seen.update(task.result()["auxiliary"])
+                        settled = settled or bool(task.result()["core"])
+                    if not self.thorough and (settled or len(aux_seen) >= 2):
+                        break
+                # 按页面中脚本顺序合并已完成的结果，保证输出稳定
+                for task in js_tasks:
+                    if task.done() and not task.cancelled():
+                        core_evidence.update(dict.fromkeys(task.result()["core"]))
+                        aux_evidence.update(dict.fromkeys(task.result()["auxiliary"]))
+        finally:
+            for js_url, task in zip(js_urls, js_tasks):
+                self._release_js_result(js_url, task)
+
+        # 3. 输出证据（有序字典在累积时已去重）
+        result["core_evidence"] = list(core_evidence)
+        result["aux_evidence"] = list(aux_evidence)
 
         # 4. 判定逻辑
         core_count = len(result["core_evidence"])
@@ -218,30 +637,99 @@ class ReactDetector:
 
         return result
 
-    async def detect_batch_urls(self, urls: List[str]) -> List[Dict[str, any]]:
-        """批量探测（控制并发）"""
-        semaphore = asyncio.Semaphore(self.concurrency)
-        
-        async def bounded_detect(url: str) -> Dict[str, any]:
-            async with semaphore:
+    async def detect_batch_urls(self, urls: Iterable[str]) -> List[Dict[str, any]]:
+        """批量探测（控制并发）：有界队列逐个消费URL，内存占用与并发数而非URL总数相关"""
+        if self.workers > 1:
+            urls = list(urls)
+            if len(urls) > 1:
+                return await self._detect_batch_multiprocess(urls)
+
+        # 按主机限流：同主机URL不再挤占其他主机的名额；空闲时允许单主机突发到总并发
+        limiter = _HostLimiter(
+            per_host=self.per_host,
+            total=self.concurrency,
+            burst_limit=max(0, self.concurrency - self.per_host),
+        )
+        # 消费者数量多于全局并发上限：多出的消费者持有URL在限流器中排队，
+        # 使限流器能在这一窗口内按主机调度，而不是按文件顺序逐个放行
+        workers = self.concurrency * _BATCH_LOOKAHEAD
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results = []  # (序号, 结果)，结束后按输入顺序排序
+
+        async def producer():
+            try:
+                for item in enumerate(urls):
+                    await queue.put(item)
+            finally:
+                for _ in range(workers):
+                    await queue.put(None)  # 通知消费者结束
+
+        async def worker(session: aiohttp.ClientSession):
+            while (item := await queue.get()) is not None:
+                index, url = item
+                async with limiter.slot(urlparse(url).netloc):
+                    results.append((index, await self.detect_single_url(url, session)))
+
+        # 整个批次共用一个会话，TCP/TLS 握手在同主机请求间摊销
+        try:
+            async with self.create_session() as session:
+                await asyncio.gather(producer(), *(worker(session) for _ in range(workers)))
+        finally:
+            await self.close()
+        results.sort(key=lambda item: item[0])
+        return [res for _, res in results]
+
+    async def _detect_batch_multiprocess(self, urls: List[str]) -> List[Dict[str, any]]:
+        """多进程批量探测：按顺序切片分给各子进程，每个子进程内仍为异步并发"""
+        workers = min(self.workers, len(urls))
+        chunk_size = -(-len(urls) // workers)
+        chunks = [urls[i:i + chunk_size] for i in range(0, len(urls), chunk_size)]
+        options = {
+            "timeout": self.timeout,
+            "concurrency": self.concurrency,
+            "per_host": self.per_host,
+            "thorough": self.thorough,
+            "max_js_bytes": self.max_js_bytes,
+            "use_playwright": self.use_playwright,
+            "user_agent": self.user_agent,
+            "cdp_endpoint": self.cdp_endpoint,
+        }
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            chunk_results = await asyncio.gather(
+                *(loop.run_in_executor(pool, _detect_chunk, options, chunk) for chunk in chunks)
+            )
+        return [res for chunk_result in chunk_results for res in chunk_result]
+
+    def run_single_url(self, url: str) -> Dict[str, any]:
+        """单个URL探测（结束后释放浏览器）"""
+        async def _detect() -> Dict[str, any]:
+            try:
                 return await self.detect_single_url(url)
+            finally:
+                await self.close()
 
-        tasks = [bounded_detect(url) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=False)
-        return results
+        return _run(_detect())
 
     def run_batch_from_file(self, file_path: str) -> List[Dict[str, any]]:
         """从文件读取URL批量探测"""
         try:
             with open(file_path, "r", encoding="utf-8") as f:
-                urls = [line.strip() for line in f if line.strip().startswith(("http://", "https://"))]
-            if not urls:
+                # 边读边探测，不预先把全部URL载入内存
+                urls = (line.strip() for line in f if line.strip().startswith(("http://", "https://")))
+                results = _run(self.detect_batch_urls(urls))
+            if not results:
                 raise ValueError("文件中无有效URL（需以http/https开头）")
-            return asyncio.run(self.detect_batch_urls(urls))
+            return results
         except Exception as e:
             print(f"读取文件失败: {str(e)}")
             return []
 
+def _detect_chunk(options: Dict[str, any], urls: List[str]) -> List[Dict[str, any]]:
+    """子进程入口：每个进程独立的探测器（会话、浏览器、JS缓存均为进程内共享）"""
+    detector = ReactDetector(**options)
+    return _run(detector.detect_batch_urls(urls))
+
 def print_results(results: List[Dict[str, any]]):
     """格式化输出（含重定向提示）"""
     print("=" * 80)
@@ -279,22 +767,29 @@ def print_results(results: List[Dict[str, any]]):
 
 if __name__ == "__main__":
     import argparse
+    multiprocessing.freeze_support()  # 兼容打包后的可执行程序
     parser = argparse.ArgumentParser(description="React资产探测工具 - 修复重定向+适配React18+")
     parser.add_argument("-u", "--url", type=str, help="单个URL探测（例：https://reactjs.org）")
     parser.add_argument("-f", "--file", type=str, help="批量探测（文件路径，每行一个URL）")
     parser.add_argument("-t", "--timeout", type=int, default=10, help="请求超时时间（默认10秒）")
     parser.add_argument("-c", "--concurrency", type=int, default=5, help="批量并发数（默认5）")
+    parser.add_argument("--per-host", type=int, default=None, help="单主机并发上限（默认为并发数的一半，空闲时可突发）")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="批量探测进程数（默认1，大批量时可设为CPU核数）")
+    parser.add_argument("--thorough", action="store_true", help="完整模式：已判定为React后仍检测全部JS，输出完整证据链")
     parser.add_argument("-p", "--playwright", action="store_true", help="使用Playwright精准模式（支持SSR/动态渲染）")
     args = parser.parse_args()
 
     detector = ReactDetector(
         timeout=args.timeout,
         concurrency=args.concurrency,
-        use_playwright=args.playwright
+        use_playwright=args.playwright,
+        workers=args.workers,
+        per_host=args.per_host,
+        thorough=args.thorough,
     )
 
     if args.url:
-        result = asyncio.run(detector.detect_single_url(args.url))
+        result = detector.run_single_url(args.url)
         print_results([result])
     elif args.file:
         results = detector.run_batch_from_file(args.file)
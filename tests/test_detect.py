@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ReactScan
+
+
+class DetectShortCircuitTest(unittest.IsolatedAsyncioTestCase):
+    """页面本地分析已得出核心证据时，非 thorough 模式不发出JS请求"""
+
+    def _make_detector(self, html, **kwargs):
+        detector = ReactScan.ReactDetector(**kwargs)
+        self.js_calls = []
+
+        async def fake_fetch_page(session, url):
+            return {
+                "html": html,
+                "js_urls": ["http://cdn.test/app.js", "http://cdn.test/vendor.js"],
+                "global_vars": [],
+                "redirect_url": url,
+                "error": None,
+            }
+
+        async def fake_check(session, js_url):
+            self.js_calls.append(js_url)
+            return {"core": ["JS源码含React核心API: useState"], "auxiliary": [], "failed": False, "partial": False}
+
+        detector.fetch_page = fake_fetch_page
+        detector.check_js_content = fake_check
+        return detector
+
+    async def test_dom_evidence_skips_js_requests(self):
+        detector = self._make_detector(b'<div id="root" data-reactroot=""></div>')
+        try:
+            result = await detector.detect_single_url("http://site.test/", session=object())
+        finally:
+            await detector.close()
+
+        self.assertTrue(result["is_react"])
+        self.assertEqual(result["core_evidence"], ["[核心] DOM含React专属属性: data-reactroot"])
+        self.assertEqual(self.js_calls, [])
+
+    async def test_no_dom_evidence_scans_js(self):
+        detector = self._make_detector(b"<div id=\"root\"></div>")
+        try:
+            result = await detector.detect_single_url("http://site.test/", session=object())
+        finally:
+            await detector.close()
+
+        self.assertTrue(result["is_react"])
+        self.assertTrue(self.js_calls)
+
+    async def test_thorough_scans_all_js(self):
+        detector = self._make_detector(b'<div data-reactroot=""></div>', thorough=True)
+        try:
+            result = await detector.detect_single_url("http://site.test/", session=object())
+        finally:
+            await detector.close()
+
+        self.assertEqual(sorted(self.js_calls), ["http://cdn.test/app.js", "http://cdn.test/vendor.js"])
+        self.assertIn("JS源码含React核心API: useState", result["core_evidence"])
+
+
+if __name__ == "__main__":
+    unittest.main()
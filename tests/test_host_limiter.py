@@ -0,0 +1,56 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ReactScan
+
+
+class HostLimiterBatchTest(unittest.IsolatedAsyncioTestCase):
+    """在批量队列模型下验证按主机限流确实生效"""
+
+    async def _run_batch(self, urls, concurrency, per_host):
+        detector = ReactScan.ReactDetector(concurrency=concurrency, per_host=per_host)
+        inflight = {}
+        events = []  # (事件类型, 主机, 该主机在途数, 总在途数)，按发生顺序记录
+
+        async def fake_detect(url, session=None):
+            host = ReactScan.urlparse(url).netloc
+            inflight[host] = inflight.get(host, 0) + 1
+            events.append(("start", host, inflight[host], sum(inflight.values())))
+            await asyncio.sleep(0.02)
+            inflight[host] -= 1
+            events.append(("end", host, inflight[host], sum(inflight.values())))
+            return {"url": url}
+
+        detector.detect_single_url = fake_detect
+        results = await detector.detect_batch_urls(iter(urls))
+        return results, events
+
+    async def test_other_host_not_starved_behind_busy_host(self):
+        urls = [f"http://a.test/{i}" for i in range(20)] + [f"http://b.test/{i}" for i in range(4)]
+        results, events = await self._run_batch(urls, concurrency=4, per_host=2)
+
+        self.assertEqual([res["url"] for res in results], urls)
+        starts = [(i, host, n, total) for i, (kind, host, n, total) in enumerate(events) if kind == "start"]
+        self.assertLessEqual(max(total for _, _, _, total in starts), 4)
+        first_b = min(i for i, host, _, _ in starts if host == "b.test")
+        last_a = max(i for i, host, _, _ in starts if host == "a.test")
+        # b.test 应在 a.test 全部开始之前就获得名额，且不超过单主机上限
+        self.assertLess(first_b, last_a)
+        self.assertLessEqual(max(n for _, host, n, _ in starts if host == "b.test"), 2)
+        # 首个 a.test 请求完成、释放名额后，下一个开始的就是 b.test（而非继续放行 a.test）
+        first_a_end = events.index(next(e for e in events if e[0] == "end" and e[1] == "a.test"))
+        next_start = next(host for i, host, _, _ in starts if i > first_a_end)
+        self.assertEqual(next_start, "b.test")
+
+    async def test_single_host_bursts_to_full_concurrency(self):
+        urls = [f"http://a.test/{i}" for i in range(12)]
+        _, events = await self._run_batch(urls, concurrency=4, per_host=2)
+        self.assertEqual(max(n for kind, _, n, _ in events if kind == "start"), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ReactScan
+
+
+class DomAttrTest(unittest.TestCase):
+    """React DOM属性只在属性名位置匹配"""
+
+    def test_attribute_names_are_found(self):
+        html = b'<div DATA-REACTROOT="" data-reactid=1 data-react-checksum><span\ndata-react-server-components></span>'
+        self.assertEqual(
+            ReactScan._find_dom_attrs(html),
+            {b"data-reactroot", b"data-reactid", b"data-react-checksum", b"data-react-server-components"},
+        )
+
+    def test_attribute_values_are_ignored(self):
+        self.assertEqual(ReactScan._find_dom_attrs(b'<a title="data-reactid x">'), set())
+        self.assertEqual(ReactScan._find_dom_attrs(b"<a title='x data-reactroot'>"), set())
+        self.assertEqual(ReactScan._find_dom_attrs(b"<a href=data-reactroot>"), set())
+
+    def test_page_text_is_ignored(self):
+        self.assertEqual(ReactScan._find_dom_attrs(b"<p>data-reactroot data-reactid</p>"), set())
+
+    def test_similar_attribute_names_are_ignored(self):
+        self.assertEqual(ReactScan._find_dom_attrs(b'<p data-reactidx="1">'), set())
+
+
+class ScriptSrcTest(unittest.TestCase):
+    """<script src> 提取跳过注释和内联脚本正文"""
+
+    def test_quoting_styles(self):
+        html = b"""<script type=module src="/a.js?x=1&amp;y=2"></script><SCRIPT data-src="no.js" src=b.js async></script><script src='c.js'></script>"""
+        self.assertEqual(ReactScan._extract_script_srcs(html), [b"/a.js?x=1&amp;y=2", b"b.js", b"c.js"])
+
+    def test_commented_out_script_is_skipped(self):
+        html = b'<!-- <script src="/old.js"></script> --><script src="/new.js"></script>'
+        self.assertEqual(ReactScan._extract_script_srcs(html), [b"/new.js"])
+
+    def test_script_tag_inside_inline_script_is_skipped(self):
+        html = b"""<script>document.write('<script src="/fake.js"><\\/script>');</script><script src="/real.js"></script>"""
+        self.assertEqual(ReactScan._extract_script_srcs(html), [b"/real.js"])
+
+
+class ContentTypeFilterTest(unittest.IsolatedAsyncioTestCase):
+    """JS内容检测按 Content-Type 排除非JS响应"""
+
+    async def asyncSetUp(self):
+        body = b"React.createElement(App)"
+
+        async def handler(request):
+            return web.Response(body=body, content_type=request.match_info["type"].replace("-", "/"))
+
+        app = web.Application()
+        app.router.add_get("/{type}/bundle.js", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.detector = ReactScan.ReactDetector(thorough=True)
+        self.session = self.detector.create_session()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+        await self.detector.close()
+
+    async def test_javascript_is_scanned(self):
+        result = await self.detector.check_js_content(self.session, str(self.server.make_url("/text-javascript/bundle.js")))
+        self.assertEqual(result["core"], ["JS源码含React核心API: React.createElement"])
+
+    async def test_html_is_rejected(self):
+        result = await self.detector.check_js_content(self.session, str(self.server.make_url("/text-html/bundle.js")))
+        self.assertEqual(result["core"], [])
+        self.assertFalse(result["failed"])
+
+    async def test_source_map_is_not_requested(self):
+        result = await self.detector.check_js_content(self.session, "http://127.0.0.1:9/app.js.map")
+        self.assertEqual(result["core"], [])
+        self.assertFalse(result["failed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ReactScan
+
+
+class JsCacheTest(unittest.IsolatedAsyncioTestCase):
+    """JS扫描结果缓存：成功结果复用，失败结果不缓存"""
+
+    async def asyncSetUp(self):
+        self.detector = ReactScan.ReactDetector()
+        self.calls = []
+        self.responses = []
+
+        async def fake_check(session, js_url):
+            self.calls.append(js_url)
+            return self.responses.pop(0)
+
+        self.detector.check_js_content = fake_check
+
+    async def _fetch(self, js_url):
+        task = self.detector.get_js_result(None, js_url)
+        try:
+            return await task
+        finally:
+            self.detector._release_js_result(js_url, task)
+
+    async def test_failed_scan_is_retried(self):
+        self.responses = [
+            {"core": [], "auxiliary": [], "failed": True, "partial": False},
+            {"core": ["JS源码含React核心API: useState"], "auxiliary": [], "failed": False, "partial": False},
+        ]
+        first = await self._fetch("http://cdn.test/vendor.js")
+        second = await self._fetch("http://cdn.test/vendor.js")
+
+        self.assertTrue(first["failed"])
+        self.assertEqual(second["core"], ["JS源码含React核心API: useState"])
+        self.assertEqual(len(self.calls), 2)
+
+    async def test_successful_scan_is_cached(self):
+        self.responses = [{"core": [], "auxiliary": [], "failed": False, "partial": False}]
+        await self._fetch("http://cdn.test/vendor.js")
+        await self._fetch("http://cdn.test/vendor.js")
+
+        self.assertEqual(len(self.calls), 1)
+
+
+class JsEarlyStopTest(unittest.IsolatedAsyncioTestCase):
+    """非 thorough 模式命中核心关键词后停止读取，并标记为不完整结果"""
+
+    async def asyncSetUp(self):
+        body = b"useState(0);" + b"x" * (1 << 20) + b"React.createElement(App)"
+
+        async def handler(request):
+            return web.Response(body=body, content_type="text/javascript")
+
+        app = web.Application()
+        app.router.add_get("/bundle.js", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.url = str(self.server.make_url("/bundle.js"))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def _check(self, thorough):
+        detector = ReactScan.ReactDetector(thorough=thorough)
+        async with detector.create_session() as session:
+            try:
+                return await detector.check_js_content(session, self.url)
+            finally:
+                await detector.close()
+
+    async def test_stops_at_first_core_hit(self):
+        result = await self._check(thorough=False)
+        self.assertEqual(result["core"], ["JS源码含React核心API: useState"])
+        self.assertTrue(result["partial"])
+
+    async def test_thorough_reads_whole_bundle(self):
+        result = await self._check(thorough=True)
+        self.assertEqual(
+            result["core"],
+            ["JS源码含React核心API: React.createElement", "JS源码含React核心API: useState"],
+        )
+        self.assertFalse(result["partial"])
+
+    async def test_partial_result_not_reused_in_thorough_mode(self):
+        detector = ReactScan.ReactDetector()
+        async with detector.create_session() as session:
+            try:
+                first = detector.get_js_result(session, self.url)
+                self.assertTrue((await first)["partial"])
+                detector._release_js_result(self.url, first)
+                detector.thorough = True
+                second = detector.get_js_result(session, self.url)
+                self.assertIsNot(second, first)
+                self.assertFalse((await second)["partial"])
+                detector._release_js_result(self.url, second)
+            finally:
+                await detector.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ReactScan
+
+
+async def _answer():
+    await asyncio.sleep(0)
+    return 42
+
+
+class RunTest(unittest.TestCase):
+    """_run 在不同 uvloop 环境下都能运行顶层协程"""
+
+    def test_without_uvloop(self):
+        with mock.patch.object(ReactScan, "uvloop", None):
+            self.assertEqual(ReactScan._run(_answer()), 42)
+
+    def test_old_uvloop_without_run(self):
+        old_uvloop = mock.Mock(spec=["new_event_loop"])
+        old_uvloop.new_event_loop.side_effect = asyncio.new_event_loop
+        with mock.patch.object(ReactScan, "uvloop", old_uvloop):
+            self.assertEqual(ReactScan._run(_answer()), 42)
+        old_uvloop.new_event_loop.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()